@@ -1,18 +1,60 @@
-from ics import Calendar, Event
-
-def make_calendar(json_data: dict, title: str = "Bin Collections"):
-    cal = Calendar()
-    for it in json_data.get("items", []):
-        d = it.get("date")
-        label = it.get("service", "Collection").title()
-        if not d:
-            continue
-        ev = Event()
-        ev.name = f"{label} bin collection"
-        ev.begin = d
-        ev.make_all_day()
-        cal.events.add(ev)
-    return cal
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+
+# RFC 5545 TEXT escaping for SUMMARY/DESCRIPTION/X-WR-CALNAME values.
+_ESCAPE = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+
+PRODID = "-//plymouth-bin-scraper//EN"
+
+def escape_text(s: str) -> str:
+    return s.translate(_ESCAPE)
+
+def fold(line: str) -> str:
+    # Content lines are limited to 75 octets; continuations start with a space.
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, cur, size = [], "", 0
+    for ch in line:
+        w = len(ch.encode("utf-8"))
+        if size + w > 75:
+            parts.append(cur)
+            cur, size = " ", 1
+        cur += ch
+        size += w
+    parts.append(cur)
+    return "\r\n".join(parts)
 
-def calendar_to_str(cal: Calendar) -> str:
-    return str(cal)
\ No newline at end of file
+def vevent(summary: str, iso_date: str, dtstamp: str, description: str | None = None) -> str:
+    day = iso_date.replace("-", "")
+    uid = hashlib.sha1(f"{summary}|{day}|{description or ''}".encode("utf-8")).hexdigest()[:16]
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@bins",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART;VALUE=DATE:{day}",
+        f"DTEND;VALUE=DATE:{(date.fromisoformat(iso_date) + timedelta(days=1)):%Y%m%d}",
+        fold(f"SUMMARY:{escape_text(summary)}"),
+    ]
+    if description:
+        lines.append(fold(f"DESCRIPTION:{escape_text(description)}"))
+    lines.append("END:VEVENT")
+    return "\r\n".join(lines)
+
+def vcalendar(name: str, events) -> str:
+    head = f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{PRODID}\r\n" + fold(f"X-WR-CALNAME:{escape_text(name)}")
+    return "\r\n".join([head, *events, "END:VCALENDAR"]) + "\r\n"
+
+def dtstamp_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+def make_calendar(json_data: dict, title: str = "Bin Collections") -> str:
+    stamp = dtstamp_now()
+    events = [
+        vevent(f"{it.get('service', 'Collection').title()} bin collection", it["date"], stamp)
+        for it in json_data.get("items", [])
+        if it.get("date")
+    ]
+    return vcalendar(title, events)
+
+def calendar_to_str(cal: str) -> str:
+    return cal
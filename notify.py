@@ -9,20 +9,38 @@ there's no collection tomorrow.
 
 import os
 import json
-from datetime import datetime, timedelta
-from urllib.request import urlopen, Request
+import random
+import sqlite3
+import ssl
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from io import BytesIO
 from urllib.error import URLError, HTTPError
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urljoin, urlsplit
 from base64 import b64encode
 
+from cache import init_db, get_cache, set_cache
+
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
 except ImportError:
     ZoneInfo = None
 
+try:
+    from orjson import loads as json_loads  # parses bytes directly, no decode copy
+except ImportError:
+    json_loads = json.loads
+
 # ---- CONFIG ----
 BIN_JSON_URL = os.getenv("BIN_JSON_URL", "").strip()
 LOCAL_JSON_PATH = "public/PL6_5HX_72_Windermere.json"  # fallback path
+# The published schedule is a few KB; refuse anything wildly bigger rather
+# than buffering it all into memory.
+MAX_JSON_BYTES = 1 << 20
+# How long a fetched schedule is served from the local SQLite cache.
+BIN_CACHE_TTL = int(os.getenv("BIN_CACHE_TTL", "3600"))
 
 # Twilio credentials (from GitHub Secrets or local .env)
 TWILIO_SID = os.getenv("TWILIO_ACCOUNT_SID") or os.getenv("TWILIO_SID")
@@ -39,29 +57,203 @@ FORCE_SEND = os.getenv("FORCE_SEND", "").lower() in {"1", "true", "yes"}
 
 UK_TZ = ZoneInfo("Europe/London") if ZoneInfo else None
 
+LABEL_MAP = {
+    "refuse": "Refuse (brown bin)",
+    "recycling": "Recycling (green bin)",
+    "garden": "Garden waste",
+}
+
+# Fixed English names, independent of the runner's locale.
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
 
 def now_uk_date():
     """Return today's date in UK timezone (handles BST/GMT)."""
-    if UK_TZ:
-        return datetime.now(UK_TZ).date()
-    return datetime.utcnow().date()
+    utc = datetime.now(timezone.utc)
+    # UK time is UTC+0 or UTC+1, so the dates can only differ from 23:00 UTC.
+    if utc.hour < 23 or not UK_TZ:
+        return utc.date()
+    return utc.astimezone(UK_TZ).date()
+
+
+# Statuses worth retrying: Pages serves 404 briefly right after a deploy.
+RETRY_STATUSES = frozenset({404, 429, 500, 502, 503, 504})
+USER_AGENT = "bins-notifier/1.0"
+# Redirect hops followed for GET/HEAD (e.g. Pages custom domain or http->https).
+MAX_REDIRECTS = 5
+
+# One keep-alive connection per (scheme, host), shared by every request.
+_CONNECTIONS = {}
+
+
+def _connection(scheme: str, host: str):
+    conn = _CONNECTIONS.get((scheme, host))
+    if conn is None:
+        cls = HTTPSConnection if scheme == "https" else HTTPConnection
+        conn = _CONNECTIONS[(scheme, host)] = cls(host, timeout=20)
+    return conn
+
+
+def _dropped(sock) -> bool:
+    """
+    True if the server has closed an idle pooled socket. Probed with a
+    non-blocking read rather than select(): under TLS 1.3 a fresh socket is
+    readable because of the NewSessionTicket records, which the read consumes.
+    """
+    timeout = sock.gettimeout()
+    try:
+        sock.setblocking(False)
+        sock.recv(1)
+    except (ssl.SSLWantReadError, BlockingIOError):
+        return False  # nothing waiting: still open
+    except OSError:
+        return True
+    finally:
+        sock.settimeout(timeout)
+    # b"" is EOF; any other byte would be an unsolicited response we can't use.
+    return True
+
+
+def _read(conn, max_bytes):
+    resp = conn.getresponse()
+    data = resp.read() if max_bytes is None else resp.read(max_bytes + 1)
+    return resp, data
+
+
+def http_request(method, url, body=None, headers=None, tries=5, base=1.0,
+                 retry_statuses=RETRY_STATUSES, max_bytes=None, idempotent=None,
+                 max_redirects=MAX_REDIRECTS):
+    """
+    Issue a request over the pooled connection for url's host, retrying
+    transient failures with exponential backoff (plus jitter).
+    Returns (status, body bytes); raises HTTPError / URLError as urlopen would.
+
+    Redirects are followed for GET/HEAD only, up to max_redirects hops; any
+    other 3xx is raised as HTTPError. Unlike urlopen, proxy settings from the
+    environment (HTTP(S)_PROXY) are not used; connections go direct.
+
+    Unless idempotent (default: GET/HEAD), a failure after the request was
+    sent is raised straight away: the server may already have acted on it.
+    """
+    if idempotent is None:
+        idempotent = method in ("GET", "HEAD")
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = {"User-Agent": USER_AGENT, **(headers or {})}
+
+    for attempt in range(tries):
+        conn = _connection(parts.scheme, parts.netloc)
+        reused = conn.sock is not None
+        if reused and not idempotent and _dropped(conn.sock):
+            # Reconnect up front: once a non-idempotent request is sent, a
+            # reset can't be told apart from a failure after it was handled.
+            conn.close()
+            reused = False
+        sent = False
+        try:
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                sent = True
+                resp, data = _read(conn, max_bytes)
+            except (ConnectionResetError, BrokenPipeError):
+                if not reused or (sent and not idempotent):
+                    raise
+                # The server dropped our idle keep-alive socket; reconnect once
+                # straight away rather than spending a backoff attempt on it.
+                conn.close()
+                sent = False
+                conn.request(method, path, body=body, headers=headers)
+                sent = True
+                resp, data = _read(conn, max_bytes)
+        except (OSError, HTTPException) as e:
+            conn.close()  # drop the dead socket; the next attempt reconnects
+            error, reason = URLError(e), str(e)
+            if sent and not idempotent:
+                raise error
+        else:
+            if max_bytes is not None and len(data) > max_bytes:
+                conn.close()  # unread remainder would poison the keep-alive
+            if resp.status < 300:
+                return resp.status, data
+            location = resp.headers.get("Location")
+            if 300 <= resp.status < 400 and location and method in ("GET", "HEAD") and max_redirects > 0:
+                return http_request(method, urljoin(url, location), body, headers, tries, base,
+                                    retry_statuses, max_bytes, idempotent, max_redirects - 1)
+            error = HTTPError(url, resp.status, resp.reason, resp.headers, BytesIO(data))
+            if resp.status not in retry_statuses:
+                raise error
+            reason = f"HTTP {resp.status}"
+        if attempt == tries - 1:
+            raise error
+        delay = base * 2 ** attempt + random.uniform(0, 0.5)
+        print(f">>> {reason} from {url}; retrying in {delay:.1f}s "
+              f"(attempt {attempt + 1}/{tries})")
+        time.sleep(delay)
+
+
+def prewarm(url) -> threading.Thread:
+    """Open the pooled connection for url's host in the background."""
+    parts = urlsplit(url)
+    conn = _connection(parts.scheme, parts.netloc)
+
+    def connect():
+        try:
+            conn.connect()
+        except OSError:
+            conn.close()  # the real request will reconnect and report errors
+
+    t = threading.Thread(target=connect, daemon=True)
+    t.start()
+    return t
+
+
+def _cached_json(key):
+    """
+    Look key up in the SQLite cache. The cache is only an optimisation, so a
+    corrupt, locked or unwritable database is logged and treated as a miss.
+    """
+    try:
+        init_db()
+        return get_cache(key, ttl_seconds=BIN_CACHE_TTL)
+    except sqlite3.Error as e:
+        print(f">>> Cache unavailable ({e}); fetching live data")
+        return None
+
+
+def _store_json(key, data):
+    try:
+        set_cache(key, data)
+    except sqlite3.Error as e:
+        print(f">>> Could not write cache ({e}); continuing")
 
 
 def fetch_json():
     """Fetch JSON from GitHub Pages or fallback to local file."""
     if BIN_JSON_URL:
+        cache_key = f"bin_json:{BIN_JSON_URL}"
+        cached = _cached_json(cache_key)
+        if cached is not None:
+            print(f">>> Using cached data for {BIN_JSON_URL}")
+            return cached
         print(f">>> Fetching live data from {BIN_JSON_URL}")
-        req = Request(BIN_JSON_URL, headers={"User-Agent": "bins-notifier/1.0"})
         try:
-            with urlopen(req, timeout=20) as r:
-                return json.loads(r.read().decode("utf-8"))
+            _, raw = http_request("GET", BIN_JSON_URL, max_bytes=MAX_JSON_BYTES)
         except HTTPError as e:
             raise SystemExit(f"HTTP error fetching {BIN_JSON_URL}: {e.code} {e.reason}")
         except URLError as e:
             raise SystemExit(f"Network error fetching {BIN_JSON_URL}: {e.reason}")
+        if len(raw) > MAX_JSON_BYTES:
+            raise SystemExit(f"Bin JSON at {BIN_JSON_URL} exceeds {MAX_JSON_BYTES} bytes")
+        data = json_loads(raw)
+        _store_json(cache_key, data)
+        return data
     print(f">>> Using local data from {LOCAL_JSON_PATH}")
-    with open(LOCAL_JSON_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(LOCAL_JSON_PATH, "rb") as f:
+        return json_loads(f.read())
 
 
 def normalize_whatsapp(num: str) -> str:
@@ -69,50 +261,98 @@ def normalize_whatsapp(num: str) -> str:
     n = (num or "").strip()
     if not n:
         return n
-    if not n.startswith("whatsapp:"):
-        n = "whatsapp:" + n
-    if not n.startswith("whatsapp:+"):
-        # handle 'whatsapp:447...' -> 'whatsapp:+447...'
-        if n.startswith("whatsapp:") and not n[len("whatsapp:"):].startswith("+"):
-            n = "whatsapp:+" + n[len("whatsapp:"):]
-    return n
+    # handle '447...', '+447...', 'whatsapp:447...' -> 'whatsapp:+447...'
+    n = n.removeprefix("whatsapp:")
+    return "whatsapp:" + (n if n.startswith("+") else "+" + n)
 
 
-def send_whatsapp(body: str):
-    """Send WhatsApp message using Twilio API (properly URL-encoded)."""
-    to = normalize_whatsapp(WHATSAPP_TO)
-    from_ = normalize_whatsapp(WHATSAPP_FROM)
+# Normalised once at import; the sender and recipient don't change per run.
+_FROM = normalize_whatsapp(WHATSAPP_FROM)
+_TO = normalize_whatsapp(WHATSAPP_TO)
+
+# Pre-encoded form prefix and Basic auth header for Twilio requests.
+# IMPORTANT: url-encode so '+' is preserved as %2B (not turned into a space)
+_FORM_FROM = f"From={quote_plus(_FROM)}&To="
+_AUTH_HEADER = "Basic " + b64encode(f"{TWILIO_SID}:{TWILIO_AUTH}".encode()).decode()
+
+
+class TokenBucket:
+    """Allow at most `rate` calls to take() per second, bursting to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+
+    def take(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
 
-    if not (TWILIO_SID and TWILIO_AUTH and to):
+
+TWILIO_API = "https://api.twilio.com"
+# Twilio's documented WhatsApp text throughput per sender.
+TWILIO_MPS = 25
+# Only statuses where Twilio did not take the message are safe to resend;
+# a 500/502/504 may come back after it was already queued.
+TWILIO_RETRY_STATUSES = frozenset({429, 503})
+_TWILIO_BUCKET = TokenBucket(TWILIO_MPS)
+
+
+def send_whatsapp_many(messages):
+    """
+    Send (to, body) pairs via the Twilio API (properly URL-encoded), reusing
+    one connection and staying under TWILIO_MPS.
+    """
+    messages = [(normalize_whatsapp(to), body) for to, body in messages]
+
+    if not (TWILIO_SID and TWILIO_AUTH and all(to for to, _ in messages)):
         raise SystemExit(
             "Missing Twilio env vars: need TWILIO_ACCOUNT_SID (or TWILIO_SID), "
             "TWILIO_AUTH_TOKEN, and TWILIO_WHATSAPP_TO (or WHATSAPP_TO/TO_NUMBER)."
         )
 
-    api = f"https://api.twilio.com/2010-04-01/Accounts/{TWILIO_SID}/Messages.json"
+    api = f"{TWILIO_API}/2010-04-01/Accounts/{TWILIO_SID}/Messages.json"
 
-    # IMPORTANT: url-encode so '+' is preserved as %2B (not turned into a space)
-    form = urlencode({"From": from_, "To": to, "Body": body}).encode("utf-8")
-
-    auth = b64encode(f"{TWILIO_SID}:{TWILIO_AUTH}".encode()).decode()
-    req = Request(api, data=form, method="POST", headers={
-        "Authorization": f"Basic {auth}",
+    headers = {
+        "Authorization": _AUTH_HEADER,
         "Content-Type": "application/x-www-form-urlencoded",
-        "User-Agent": "bins-notifier/1.0",
-    })
+    }
+
+    for to, body in messages:
+        form = f"{_FORM_FROM}{quote_plus(to)}&Body={quote_plus(body)}".encode("ascii")
+        _TWILIO_BUCKET.take()
+        try:
+            status, resp_body = http_request(
+                "POST", api, body=form, headers=headers,
+                retry_statuses=TWILIO_RETRY_STATUSES,
+            )
+            # The body is only decoded on failure (see HTTPError below).
+            print(f">>> Twilio: {status} ({len(resp_body)} bytes)")
+        except HTTPError as e:
+            err = e.read().decode("utf-8", "ignore")
+            raise SystemExit(f"Twilio HTTP {e.code}: {e.reason}\n{err}")
+        except URLError as e:
+            raise SystemExit(f"Twilio network error: {e.reason}")
 
-    try:
-        with urlopen(req, timeout=20) as resp:
-            print(">>> Twilio:", resp.status, resp.read().decode("utf-8"))
-    except HTTPError as e:
-        err = e.read().decode("utf-8", "ignore")
-        raise SystemExit(f"Twilio HTTP {e.code}: {e.reason}\n{err}")
-    except URLError as e:
-        raise SystemExit(f"Twilio network error: {e.reason}")
+
+def send_whatsapp(body: str):
+    """Send one WhatsApp message to the configured recipient."""
+    send_whatsapp_many([(_TO, body)])
 
 
 def main():
+    # Overlap the Twilio TLS handshake with the schedule fetch.
+    warm = prewarm(TWILIO_API) if TWILIO_SID and TWILIO_AUTH else None
     data = fetch_json()
+    if warm:
+        warm.join()
     postcode = data.get("postcode", "")
     hint = data.get("address_hint", "")
     collections = data.get("collections", {})
@@ -120,21 +360,12 @@ def main():
     today = now_uk_date()
     tomorrow = today + timedelta(days=1)
 
-    # Gather tomorrow’s bins
+    # Gather tomorrow’s bins; dates are ISO strings, so compare them as-is
+    target = tomorrow.isoformat()
     services = []
     for key, arr in collections.items():
-        for s in (arr or []):
-            try:
-                d = datetime.strptime(s, "%Y-%m-%d").date()
-            except ValueError:
-                continue
-            if d == tomorrow:
-                label = {
-                    "refuse": "Refuse (brown bin)",
-                    "recycling": "Recycling (green bin)",
-                    "garden": "Garden waste",
-                }.get(key, key.title())
-                services.append(label)
+        if target in (arr or ()):
+            services.append(LABEL_MAP.get(key) or key.title())
 
     # Always allow a manual test if FORCE_SEND is on
     if FORCE_SEND:
@@ -150,7 +381,7 @@ def main():
         print(">>> No collections tomorrow — no WhatsApp sent.")
         return
 
-    nice_date = tomorrow.strftime("%A %d %B")
+    nice_date = f"{_WEEKDAYS[tomorrow.weekday()]} {tomorrow.day:02d} {_MONTHS[tomorrow.month - 1]}"
     lines = [
         f"Bin reminder for {postcode} — {hint}",
         f"Tomorrow ({nice_date}):",
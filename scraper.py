@@ -9,15 +9,20 @@ import asyncio
 import json
 import os
 import re
+from calendar import isleap
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
-from dateutil.tz import gettz
-from ics import Calendar, Event
-from ics.grammar.parse import ContentLine
-from playwright.async_api import async_playwright, Frame
+from playwright.async_api import async_playwright, Browser, Frame
+
+import ics_gen
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # -----------------------------------
@@ -34,16 +39,95 @@ DEFAULT_FORM_URL = (
     "&process_id=AF-Process-084d6742-3572-41ba-ac1a-430750451f9d"
 )
 
-UK_TZ = gettz("Europe/London")
-
 RE_TODAY_LINE = re.compile(r"\btoday\b", re.IGNORECASE)
 
-DATE_PATTERNS = (
-    r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun|Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s*\d{2}/\d{2}/\d{4}\b",
-    r"\b\d{2}/\d{2}/\d{4}\b",
+# Accessible-name patterns for the form's controls.
+RE_POSTCODE_LABEL = re.compile(r"post.*code|street|postcode", re.IGNORECASE)
+RE_FIND_BUTTON = re.compile(r"find|search", re.IGNORECASE)
+RE_COLLECTION_DETAILS = re.compile(r"Collection Details", re.IGNORECASE)
+RE_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+# Same rule as RE_UNSAFE_FILENAME_CHARS as a translate table, for ASCII input.
+FILENAME_ASCII_TABLE = {
+    c: c if chr(c).isalnum() or chr(c) in "_.-" else ord("_")
+    for c in range(128)
+}
+
+# The page prints dates as "Monday 01/01/2026"; the weekday adds nothing, so
+# only the DD/MM/YYYY part is matched. Digit boundaries rather than \b, since
+# innerText glues adjacent inline elements together ("Monday01/01/2026").
+DATE_ANY_REGEX = re.compile(r"(?<!\d)\d{2}/\d{2}/\d{4}(?!\d)")
+
+# Days per month (index 1-12) for validating DD/MM/YYYY without strptime.
+MONTH_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+RE_TRACKER_HOST = re.compile(
+    r"^https?://[^/]*(?:google-analytics|googletagmanager|doubleclick|hotjar|facebook)\.",
+    re.IGNORECASE,
 )
 
-DATE_ANY_REGEX = re.compile(DATE_PATTERNS[1])
+# Inputs that can hold the postcode. find_form_frame probes frames with this
+# and find_visible_textbox falls back to it, so a frame chosen by the probe
+# always has an input the resolver can return.
+TEXT_INPUT_SELECTOR = "input[type='text'], input:not([type])"
+
+# In-browser predicates for frame.evaluate / frame.wait_for_function.
+JS_HAS_VISIBLE_TEXT_INPUT = """
+sel => Array.from(document.querySelectorAll(sel))
+  .some(el => {
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== "hidden";
+  })
+"""
+
+JS_HAS_ADDRESS_OPTIONS = """
+() => Array.from(document.querySelectorAll("select")).some(s => s.options.length > 1)
+"""
+
+JS_SELECT_OPTIONS = """
+el => Array.from(el.options).map(o => [o.value, o.text])
+"""
+
+# Date-gated predicates take DATE_ANY_REGEX.pattern as their argument, so the
+# browser-side check and the Python parser share one date rule.
+JS_HAS_MAIN_RESULTS = """
+dateSrc => {
+  const t = (document.body && document.body.innerText) || "";
+  return /Brown domestic bin|Green recycling bin/i.test(t) && new RegExp(dateSrc).test(t);
+}
+"""
+
+# The garden waste section can render after refuse/recycling; true once a
+# garden waste heading is followed by a date.
+JS_HAS_GARDEN_RESULTS = """
+dateSrc => {
+  const t = (document.body && document.body.innerText) || "";
+  const i = t.search(/garden waste/i);
+  return i >= 0 && new RegExp(dateSrc).test(t.slice(i));
+}
+"""
+
+JS_BODY_TEXT = """
+() => (document.body && document.body.innerText) || ""
+"""
+
+# True once the main collection is shown and innerText has been unchanged for
+# three polls in a row; the previous read is kept on window between polls.
+JS_TEXT_STABLE = """
+() => {
+  const t = (document.body && document.body.innerText) || "";
+  if (!t.includes("Collection Details") ||
+      !(t.includes("Brown domestic bin") || t.includes("Green recycling bin"))) {
+    window.__binsLast = t;
+    window.__binsStable = 0;
+    return false;
+  }
+  window.__binsStable = t === window.__binsLast ? (window.__binsStable || 0) + 1 : 0;
+  window.__binsLast = t;
+  return window.__binsStable >= 3;
+}
+"""
 
 SERVICE_KEYWORDS = {
     "refuse": (
@@ -69,6 +153,21 @@ SERVICE_KEYWORDS = {
 }
 
 
+# One tokenizer for the whole results text. At each line start the "today" branch is
+# tried first and swallows that line; otherwise the leftmost service keyword or date wins.
+# Dates are the most common token, so their branch comes straight after "today"; it
+# starts with a digit and the keywords with a letter, so the order never changes a match.
+RE_PARSE_TOKENS = re.compile(
+    rf"(?m)^(?P<today>[^\n]*{RE_TODAY_LINE.pattern}[^\n]*)"
+    + f"|(?P<date>{DATE_ANY_REGEX.pattern})"
+    + "".join(
+        f"|(?P<{svc}>{'|'.join(map(re.escape, keys))})"
+        for svc, keys in SERVICE_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+
+
 # -----------------------------------
 # Helpers
 # -----------------------------------
@@ -80,29 +179,49 @@ def env_bool(name: str, default: bool = False) -> bool:
     return v.strip().lower() in {"1", "true", "yes", "y"}
 
 
-def sanitize_filename(s: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_.-]", "_", s)
+# The environment doesn't change during a run, so it is read once here.
+FORM_URL = os.getenv("FORM_URL", DEFAULT_FORM_URL)
+HEADLESS = env_bool("HEADLESS", True)
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "public"))
+DEBUG_PAUSE = env_bool("DEBUG_PAUSE", False)
+PRETTY_JSON = env_bool("PRETTY_JSON", False)
 
 
-def ddmmyyyy_to_iso(text: str) -> Optional[str]:
-    m = re.search(r"(\d{2}/\d{2}/\d{4})", text)
-    if not m:
-        return None
+def dumps_json_bytes(data, pretty: bool = False) -> bytes:
+    """
+    UTF-8 JSON via orjson when available, stdlib json otherwise. Compact unless
+    pretty is set, in which case it is indented by two spaces.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
-    try:
-        return datetime.strptime(m.group(1), "%d/%m/%Y").date().isoformat()
-    except ValueError:
-        return None
 
+def dumps_pretty(data) -> str:
+    return dumps_json_bytes(data, pretty=True).decode("utf-8")
 
-def classify_service_from_text(line: str, current: Optional[str]) -> Optional[str]:
-    t = line.lower()
 
-    for svc, keys in SERVICE_KEYWORDS.items():
-        if any(k in t for k in keys):
-            return svc
+def sanitize_filename(s: str) -> str:
+    if s.isascii():
+        return s.translate(FILENAME_ASCII_TABLE)
+    return RE_UNSAFE_FILENAME_CHARS.sub("_", s)
 
-    return current
+
+def dmy_to_iso(dmy: str) -> Optional[str]:
+    """
+    Convert an exact "DD/MM/YYYY" string to ISO, or None if it is not a real date.
+    """
+    day, month, year = dmy[0:2], dmy[3:5], dmy[6:10]
+    d, mo, y = int(day), int(month), int(year)
+
+    if not y or not 1 <= mo <= 12:
+        return None
+    if not 1 <= d <= (29 if mo == 2 and isleap(y) else MONTH_DAYS[mo]):
+        return None
+
+    return f"{year}-{month}-{day}"
 
 
 @dataclass
@@ -127,56 +246,67 @@ class ScrapeResult:
         for k, arr in self.collections.items():
             arr[:] = sorted(set(arr))
 
+    def to_dict(self) -> dict:
+        return {
+            "postcode": self.postcode,
+            "address_hint": self.address_hint,
+            "collections": self.collections,
+            "scraped_at": self.scraped_at,
+        }
+
 
 # -----------------------------------
 # Playwright: drive the form
 # -----------------------------------
 
+class FormForbidden(RuntimeError):
+    """AchieveService sent the browser to /forbidden instead of the form."""
+
+
+def is_forbidden(page) -> bool:
+    return "/forbidden" in page.url.lower()
+
+
 async def find_form_frame(page) -> Frame:
     """
     Find the frame that actually contains a visible postcode/street input.
     AchieveForms may render directly in the main frame or inside an about:blank iframe.
+    Raises FormForbidden if the page is redirected to /forbidden meanwhile.
     """
     print(">>> Searching frames for visible postcode/street input...")
 
-    for attempt in range(1, 41):  # approx 20 seconds
-        for fr in page.frames:
-            try:
-                textbox = fr.get_by_role(
-                    "textbox",
-                    name=re.compile(r"post.*code|street|postcode", re.I),
-                ).first
-
-                try:
-                    await textbox.wait_for(state="visible", timeout=300)
-                    print(f">>> Found visible postcode/street textbox in frame: {fr.url}")
-                    return fr
-                except Exception:
-                    pass
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + 20
+    delay = 0.1
+    attempt = 0
 
-                inputs = fr.locator("input[type='text']")
-                count = await inputs.count()
+    while loop.time() < deadline:
+        attempt += 1
 
-                for i in range(count):
-                    inp = inputs.nth(i)
-                    try:
-                        await inp.wait_for(state="visible", timeout=300)
-                        print(f">>> Found visible text input in frame: {fr.url}")
-                        return fr
-                    except Exception:
-                        continue
+        if is_forbidden(page):
+            raise FormForbidden(page.url)
 
+        for fr in page.frames:
+            try:
+                # One round-trip per frame instead of a locator wait per candidate input.
+                if await fr.evaluate(JS_HAS_VISIBLE_TEXT_INPUT, TEXT_INPUT_SELECTOR):
+                    print(f">>> Found visible text input in frame: {fr.url}")
+                    return fr
             except Exception:
-                continue
+                continue  # frame navigated or detached mid-probe
 
-        if attempt in (1, 10, 20, 30, 40):
-            print(f">>> Still looking for visible input... attempt {attempt}/40")
+        if attempt == 1 or attempt % 10 == 0:
+            print(f">>> Still looking for visible input... attempt {attempt}")
             print(">>> Current frames:")
             for fr in page.frames:
                 print(f"   - {fr.url}")
 
-        await page.wait_for_timeout(500)
+        # Back off from 100ms to 1s: fast when the form is quick, few probes when it is slow.
+        await page.wait_for_timeout(int(delay * 1000))
+        delay = min(delay * 1.5, 1.0)
 
+    if is_forbidden(page):
+        raise FormForbidden(page.url)
     raise RuntimeError("Could not find a visible postcode/street input in any frame.")
 
 
@@ -187,14 +317,14 @@ async def find_visible_textbox(form_frame: Frame):
     try:
         textbox = form_frame.get_by_role(
             "textbox",
-            name=re.compile(r"post.*code|street|postcode", re.I),
+            name=RE_POSTCODE_LABEL,
         ).first
         await textbox.wait_for(state="visible", timeout=5000)
         return textbox
     except Exception:
         pass
 
-    inputs = form_frame.locator("input[type='text']")
+    inputs = form_frame.locator(TEXT_INPUT_SELECTOR)
     count = await inputs.count()
 
     for i in range(count):
@@ -210,26 +340,31 @@ async def find_visible_textbox(form_frame: Frame):
 
 async def run_form(page, form_url: str, postcode: str, address_hint: str) -> Frame:
     # Retry because AchieveService can intermittently return /forbidden.
+    # goto only waits for the response to commit, so a redirect made from script
+    # happens later; find_form_frame watches page.url for it while it polls.
     for attempt in range(1, 4):
-        await page.goto(form_url, wait_until="domcontentloaded")
+        await page.goto(form_url, wait_until="commit")
         print(f">>> Page URL attempt {attempt}: {page.url}")
 
-        if "/forbidden" not in page.url.lower():
-            break
+        try:
+            if is_forbidden(page):
+                raise FormForbidden(page.url)
+
+            print(">>> Frames discovered:")
+            for fr in page.frames:
+                print(f"   - {fr.url}")
 
-        print(">>> Hit /forbidden; retrying after 5 seconds...")
-        await page.wait_for_timeout(5000)
+            form_frame = await find_form_frame(page)
+            break
+        except FormForbidden:
+            print(">>> Hit /forbidden; retrying after 5 seconds...")
+            await page.wait_for_timeout(5000)
     else:
         raise RuntimeError(
             "Plymouth/AchieveService returned /forbidden after 3 attempts. "
             "This means the runner/browser is being blocked before the form loads."
         )
 
-    print(">>> Frames discovered:")
-    for fr in page.frames:
-        print(f"   - {fr.url}")
-
-    form_frame = await find_form_frame(page)
     print(f">>> Using frame: {getattr(form_frame, 'url', '[frame]')}")
 
     textbox = await find_visible_textbox(form_frame)
@@ -238,56 +373,53 @@ async def run_form(page, form_url: str, postcode: str, address_hint: str) -> Fra
     print(f">>> Filled postcode: {postcode}")
 
     try:
-        await form_frame.get_by_role("button", name=re.compile("find|search", re.I)).click(timeout=10000)
+        await form_frame.get_by_role("button", name=RE_FIND_BUTTON).click(timeout=10000)
     except Exception:
         await textbox.press("Enter")
 
     select = form_frame.get_by_role("combobox").first
     await select.wait_for(state="visible", timeout=30000)
+    # The placeholder option renders first; wait in-browser for real addresses.
+    await form_frame.wait_for_function(JS_HAS_ADDRESS_OPTIONS, timeout=30000, polling=250)
 
-    try:
-        all_texts = await select.all_inner_texts()
-        first = all_texts[0] if all_texts else ""
-        print(f">>> Address options (first few): {first.splitlines()[:5]} ...")
-    except Exception:
-        pass
+    # One round-trip for every option's value and label; matching happens here.
+    options: List[List[str]] = await select.evaluate(JS_SELECT_OPTIONS)
+    print(f">>> Address options (first few): {[text for _, text in options[:5]]} ...")
 
-    opt_xpath = (
-        "//option[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), "
-        f"'{address_hint.lower()}')]"
-    )
-    options = form_frame.locator(opt_xpath)
+    hint = address_hint.casefold()
+    match = next(((value, text) for value, text in options if hint in text.casefold()), None)
 
-    if await options.count():
-        value = await options.first.get_attribute("value")
+    if match:
+        value, chosen = match
         await select.select_option(value=value)
-        chosen = (await options.first.inner_text()).strip()
     else:
         await select.select_option(index=1)
-        chosen = (await select.input_value()).strip()
+        chosen = options[1][1] if len(options) > 1 else ""
 
-    print(f">>> Selected address: {chosen}")
+    chosen = chosen.strip()
 
-    await form_frame.get_by_text(re.compile(r"Collection Details", re.I)).wait_for(timeout=30000)
+    print(f">>> Selected address: {chosen}")
 
-    # Garden waste can load separately; wait for refuse/recycling headings too.
-    for _ in range(30):
-        brown = await form_frame.get_by_role(
-            "heading",
-            name=re.compile(r"Brown domestic bin", re.I),
-        ).count()
-        green = await form_frame.get_by_role(
-            "heading",
-            name=re.compile(r"Green recycling bin", re.I),
-        ).count()
+    await form_frame.get_by_text(RE_COLLECTION_DETAILS).wait_for(timeout=30000)
 
-        if brown > 0 or green > 0:
-            break
-
-        await form_frame.wait_for_timeout(500)
+    # Garden waste can load separately; wait for refuse/recycling dates too.
+    # Evaluated inside the page, so this is one round-trip rather than a poll loop.
+    try:
+        await form_frame.wait_for_function(
+            JS_HAS_MAIN_RESULTS, arg=DATE_ANY_REGEX.pattern, timeout=15000, polling=250
+        )
+    except Exception:
+        print(">>> WARNING: refuse/recycling dates not detected within 15s; continuing.")
 
-    # Belt and braces: AchieveForms can render the garden waste section shortly after refuse/recycling.
-    await form_frame.wait_for_timeout(3000)
+    # Belt and braces: AchieveForms can render the garden waste section shortly after
+    # refuse/recycling. Wait for it, capped at the 3s this step used to sleep for;
+    # addresses without garden waste just run into the cap.
+    try:
+        await form_frame.wait_for_function(
+            JS_HAS_GARDEN_RESULTS, arg=DATE_ANY_REGEX.pattern, timeout=3000, polling=250
+        )
+    except Exception:
+        print(">>> No garden waste dates within 3s; continuing without them.")
 
     print(">>> Main collection details detected.")
     return form_frame
@@ -302,124 +434,177 @@ async def extract_text_content(form_frame: Frame) -> str:
     Extract visible text from the full form frame using innerText.
     Wait until the main collection details section is present, then wait for the
     visible text to stabilise so later-loaded garden waste data is not missed.
+    The stability check runs in the page, so the text is only sent across once.
     """
-    last_content = ""
-    stable_count = 0
-    best_content = ""
-
-    for _ in range(30):  # approx 15 seconds
-        content = await form_frame.evaluate(
-            """
-() => (document.body && document.body.innerText) ? document.body.innerText : ""
-"""
-        )
-        content = (content or "").replace("\r\n", "\n").strip()
-
-        has_main_collection = (
-            "Collection Details" in content
-            and (
-                "Brown domestic bin" in content
-                or "Green recycling bin" in content
-            )
-        )
-
-        if has_main_collection:
-            best_content = content
-
-            # Wait until the content stops changing. This catches garden waste if it loads slightly later.
-            if content == last_content:
-                stable_count += 1
-            else:
-                stable_count = 0
-
-            if stable_count >= 3:
-                return content
-
-        last_content = content
-        await form_frame.wait_for_timeout(500)
+    try:
+        await form_frame.wait_for_function(JS_TEXT_STABLE, timeout=15000, polling=500)
+    except Exception:
+        print(">>> WARNING: collection text did not settle within 15s; using what is there.")
 
-    return best_content or last_content
+    content = await form_frame.evaluate(JS_BODY_TEXT)
+    return (content or "").replace("\r\n", "\n").strip()
 
 
 def parse_collections_from_text(full_text: str) -> Dict[str, List[str]]:
-    lines = [ln.strip() for ln in full_text.splitlines() if ln and ln.strip()]
-    collections: Dict[str, List[str]] = {
-        "refuse": [],
-        "recycling": [],
-        "garden": [],
+    """
+    Single pass over the text: service keywords switch the current section and
+    each date that follows is filed under it. Lines mentioning "today" are skipped.
+    """
+    # Sets while scanning so repeated dates cost nothing; sorted lists at the end.
+    collections: Dict[str, Set[str]] = {
+        "refuse": set(),
+        "recycling": set(),
+        "garden": set(),
     }
-    current_service: Optional[str] = None
-    re_dates = [re.compile(p) for p in DATE_PATTERNS]
+    # Timeouts and error pages carry no dates at all; skip the tokenizer for them.
+    if not full_text or not DATE_ANY_REGEX.search(full_text):
+        return {k: [] for k in collections}
 
-    for ln in lines:
-        if RE_TODAY_LINE.search(ln):
-            continue
-
-        current_service = classify_service_from_text(ln, current_service)
-
-        matches: List[str] = []
-        for rx in re_dates:
-            matches.extend(rx.findall(ln))
+    current_service: Optional[str] = None
 
-        if not current_service:
-            continue
+    for m in RE_PARSE_TOKENS.finditer(full_text):
+        kind = m.lastgroup
 
-        for raw in matches:
-            iso = ddmmyyyy_to_iso(raw)
-            if not iso:
+        if kind == "date":
+            if not current_service:
                 continue
 
-            if iso not in collections[current_service]:
-                collections[current_service].append(iso)
+            iso = dmy_to_iso(m.group())
+            if iso:
+                collections[current_service].add(iso)
+        elif kind != "today":
+            current_service = kind
 
-    for k in collections:
-        collections[k] = sorted(set(collections[k]))
-
-    return collections
+    return {k: sorted(v) for k, v in collections.items()}
 
 
 # -----------------------------------
 # ICS writer
 # -----------------------------------
 
-def build_ics(postcode: str, address_hint: str, collections: Dict[str, List[str]]) -> str:
-    cal = Calendar()
-    cal.extra.append(ContentLine(name="X-WR-CALNAME", value=f"Bin collections — {postcode} — {address_hint}"))
+ICS_TITLES = {
+    "refuse": "Refuse (brown bin)",
+    "recycling": "Recycling (green bin)",
+    "garden": "Garden waste",
+}
 
-    titles = {
-        "refuse": "Refuse (brown bin)",
-        "recycling": "Recycling (green bin)",
-        "garden": "Garden waste",
-    }
+
+def build_ics(postcode: str, address_hint: str, collections: Dict[str, List[str]]) -> str:
+    """
+    Write the calendar as plain iCalendar text, one all-day event per date.
+    """
+    stamp = ics_gen.dtstamp_now()
+    events = []
 
     for service, dates in collections.items():
-        title = titles.get(service, service.title())
+        title = ICS_TITLES.get(service, service.title())
+        description = f"{title} — {postcode} — {address_hint}"
 
         for iso in dates:
-            d = datetime.strptime(iso, "%Y-%m-%d").date()
-            ev = Event()
-            ev.name = title
-            ev.begin = d
-            ev.make_all_day()
-            ev.description = f"{title} — {postcode} — {address_hint}"
-            cal.events.add(ev)
+            events.append(ics_gen.vevent(title, iso, stamp, description))
 
-    return cal.serialize()
+    return ics_gen.vcalendar(f"Bin collections — {postcode} — {address_hint}", events)
 
 
 # -----------------------------------
 # Main scrape + outputs
 # -----------------------------------
 
+async def block_unneeded_requests(route):
+    """
+    Abort images, fonts, media and analytics; they play no part in the form flow.
+    Stylesheets are kept: visibility checks and innerText depend on them.
+    """
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES or RE_TRACKER_HOST.search(req.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# One Chromium per process, shared by every scrape; each scrape gets its own context.
+# _browser_users counts running scrape/scrape_many calls so only the last one closes it.
+_pw = None
+_browser: Optional[Browser] = None
+_browser_users = 0
+_browser_lock = asyncio.Lock()
+
+
+async def get_browser(headless: bool) -> Browser:
+    """
+    Launch Chromium on first use and hand back the same instance afterwards.
+    headless only applies to that launch; later calls get the running browser
+    whatever they pass.
+    """
+    global _pw, _browser
+
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _pw is None:
+                _pw = await async_playwright().start()
+            _browser = await _pw.chromium.launch(
+                headless=headless,
+                args=[
+                    "--disable-blink-features=AutomationControlled",
+                    "--no-sandbox",
+                    "--disable-dev-shm-usage",
+                    "--disable-gpu",
+                    "--blink-settings=imagesEnabled=false",
+                    "--disable-extensions",
+                    "--disable-background-networking",
+                    "--disable-features=Translate,BackForwardCache",
+                ],
+            )
+        return _browser
+
+
+async def close_browser():
+    """
+    Shut down the shared browser and Playwright driver, if they were started.
+    This closes it even while scrape_many calls are still using it.
+    """
+    async with _browser_lock:
+        await _close_browser_locked()
+
+
+async def _close_browser_locked():
+    global _pw, _browser
+
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _pw is not None:
+        await _pw.stop()
+        _pw = None
+
+
+async def _hold_browser():
+    global _browser_users
+
+    async with _browser_lock:
+        _browser_users += 1
+
+
+async def _release_browser():
+    """
+    Drop one scrape/scrape_many hold on the shared browser; the last one closes it.
+    """
+    global _browser_users
+
+    async with _browser_lock:
+        _browser_users -= 1
+        if _browser_users == 0:
+            await _close_browser_locked()
+
+
 async def scrape(postcode: str, address_hint: str, form_url: str, headless: bool) -> "ScrapeResult":
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(
-            headless=headless,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",
-            ],
-        )
+    """
+    Look up one address. Holds the shared browser while it runs, so a
+    standalone call launches Chromium and shuts it down again afterwards.
+    """
+    await _hold_browser()
+    try:
+        browser = await get_browser(headless)
 
         context = await browser.new_context(
             user_agent=(
@@ -435,52 +620,85 @@ async def scrape(postcode: str, address_hint: str, form_url: str, headless: bool
             },
         )
 
-        page = await context.new_page()
+        await context.route("**/*", block_unneeded_requests)
+
+        try:
+            page = await context.new_page()
+
+            if DEBUG_PAUSE:
+                await page.pause()
+
+            form_frame = await run_form(page, form_url, postcode, address_hint)
+            text_blob = await extract_text_content(form_frame)
+        finally:
+            await context.close()
+    finally:
+        await _release_browser()
 
-        if env_bool("DEBUG_PAUSE", False):
-            await page.pause()
+    print(">>> Extracted text preview:")
+    print("\n".join(text_blob.splitlines()[:160]))
 
-        form_frame = await run_form(page, form_url, postcode, address_hint)
-        text_blob = await extract_text_content(form_frame)
+    if not DATE_ANY_REGEX.search(text_blob):
+        preview = "\n".join(text_blob.splitlines()[:80])
+        print(">>> WARNING: no DD/MM/YYYY detected in extracted text. Preview:")
+        print(preview)
 
-        print(">>> Extracted text preview:")
-        print("\n".join(text_blob.splitlines()[:160]))
+    # Already sorted and de-duplicated per service; no sort_dedupe() needed.
+    collections = parse_collections_from_text(text_blob)
 
-        if not DATE_ANY_REGEX.search(text_blob):
-            preview = "\n".join(text_blob.splitlines()[:80])
-            print(">>> WARNING: no DD/MM/YYYY detected in extracted text. Preview:")
-            print(preview)
+    return ScrapeResult(postcode=postcode, address_hint=address_hint, collections=collections)
 
-        collections = parse_collections_from_text(text_blob)
-        await browser.close()
 
-    res = ScrapeResult(postcode=postcode, address_hint=address_hint, collections=collections)
-    res.sort_dedupe()
-    return res
+async def scrape_many(
+    targets: List[Tuple[str, str]],
+    form_url: str,
+    headless: bool,
+    concurrency: int = 4,
+) -> List["ScrapeResult"]:
+    """
+    Scrape several (postcode, address_hint) pairs on one shared browser, at most
+    `concurrency` at a time. Results keep input order. If any target fails, the
+    rest are cancelled and the first error is raised. The browser is closed once
+    no scrape or scrape_many call is using it any more.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(postcode: str, address_hint: str) -> "ScrapeResult":
+        async with sem:
+            return await scrape(postcode, address_hint, form_url, headless)
+
+    # Our own hold keeps Chromium up between targets, not just during each one.
+    await _hold_browser()
+    tasks = [asyncio.create_task(one(pc, hint)) for pc, hint in targets]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        # On failure, stop the other targets before the browser can close under
+        # them; queued ones would otherwise launch a new browser nobody closes.
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _release_browser()
+
+
+async def scrape_once(postcode: str, address_hint: str, form_url: str, headless: bool) -> "ScrapeResult":
+    """
+    Run a single scrape and release the shared browser afterwards (CLI use).
+    """
+    results = await scrape_many([(postcode, address_hint)], form_url, headless)
+    return results[0]
 
 
 def write_outputs(res: ScrapeResult, outdir: Path) -> Tuple[Path, Path]:
     outdir.mkdir(parents=True, exist_ok=True)
 
-    base = f"{sanitize_filename(res.postcode.replace(' ', '_'))}_{sanitize_filename(res.address_hint.replace(' ', '_'))}"
+    base = f"{sanitize_filename(res.postcode)}_{sanitize_filename(res.address_hint)}"
     json_path = outdir / f"{base}.json"
     ics_path = outdir / f"{base}.ics"
 
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "postcode": res.postcode,
-                "address_hint": res.address_hint,
-                "collections": res.collections,
-                "scraped_at": res.scraped_at,
-            },
-            f,
-            indent=2,
-            ensure_ascii=False,
-        )
-
-    with ics_path.open("w", encoding="utf-8") as f:
-        f.write(build_ics(res.postcode, res.address_hint, res.collections))
+    # Compact by default; PRETTY_JSON=true keeps the old indented layout.
+    json_path.write_bytes(dumps_json_bytes(res.to_dict(), pretty=PRETTY_JSON))
+    ics_path.write_text(build_ics(res.postcode, res.address_hint, res.collections), encoding="utf-8", newline="")
 
     return json_path, ics_path
 
@@ -490,10 +708,6 @@ def write_outputs(res: ScrapeResult, outdir: Path) -> Tuple[Path, Path]:
 # -----------------------------------
 
 if __name__ == "__main__":
-    FORM_URL = os.getenv("FORM_URL", DEFAULT_FORM_URL)
-    HEADLESS = env_bool("HEADLESS", True)
-    OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "public"))
-
     postcode = (
         os.getenv("POSTCODE")
         or os.getenv("POSTCODE_INPUT")
@@ -511,17 +725,9 @@ if __name__ == "__main__":
     print(f">>> Headless: {HEADLESS}")
     print(f">>> Postcode: {postcode} | Address hint: {address_hint}")
 
-    result = asyncio.run(scrape(postcode, address_hint, FORM_URL, HEADLESS))
-
-    print(json.dumps(
-        {
-            "postcode": result.postcode,
-            "address_hint": result.address_hint,
-            "collections": result.collections,
-            "scraped_at": result.scraped_at,
-        },
-        indent=2,
-    ))
+    result = asyncio.run(scrape_once(postcode, address_hint, FORM_URL, HEADLESS))
+
+    print(dumps_pretty(result.to_dict()))
 
     jp, ip = write_outputs(result, OUTPUT_DIR)
     print(f">>> Wrote: {jp}")